@@ -9,6 +9,7 @@
 # Standard Library
 import contextlib
 import functools
+import importlib.util
 import itertools
 import sys
 
@@ -17,8 +18,9 @@ import traitlets
 
 try:
     import ipywidgets
-except:
+except ImportError:
     ipywidgets = None
+display = IPython.display.display
 
 if __name__ == "__main__":
     get_ipython = IPython.get_ipython
@@ -47,13 +49,23 @@ class TraitletOutput(IPython.display.DisplayHandle, Output):
         """`TraitletOutput._ipython_display_` displays the `TraitletOutput.description` if it exists 
 and then displays the `TraitletOutput.value`.  `TraitletOutput` manages updating existing display objects."""
 
-        if TraitletOutput.description:
-            IPython.display.display(IPython.display.Markdown("#### " + TraitletOutput.description))
+        if TraitletOutput.header is not None:
+            display(TraitletOutput.header)
         TraitletOutput.display(TraitletOutput.value)
 
+    header = traitlets.Any()
+
+    @traitlets.observe("description")
+    def _change_description(TraitletOutput, change):
+        """`TraitletOutput.header` holds one `IPython.display.Markdown` per `TraitletOutput.description` so redisplays reuse it."""
+
+        str = change["new"]
+        TraitletOutput.header = str and IPython.display.Markdown("#### " + str) or None
+
     @traitlets.observe("value")
     def _change_value(TraitletOutput, change):
-        """When `TraitletOutput.value` changes `TraitletOutput._change_value` triggers the `IPython.display.DisplayHandle` to __update__."""
+        """When `TraitletOutput.value` changes `TraitletOutput._change_value` triggers the `IPython.display.DisplayHandle` to __update__ within the request that made the change;
+a burst of changes made under `hold_trait_notifications` updates once."""
 
         TraitletOutput.update(change["new"])
 
@@ -104,13 +116,16 @@ class Handler(traitlets.HasTraits):
     callable = traitlets.Any()
     globals = traitlets.Dict()
     locals = traitlets.Dict()
+    links = traitlets.List()
 
     def __init__(App, *globals, wait=False, parent=None, **locals):
         func = locals.pop("callable", None)
         parent = parent or IPython.get_ipython()
+        user_ns = parent.user_ns
         globals = {
-            str: parent.user_ns.get(str, None)
-            for str in map(str.strip, itertools.chain(*map(str.split, globals)))
+            str: user_ns.get(str)
+            for object in globals
+            for str in object.split()
             if str not in locals
         }
         locals.update(
@@ -120,43 +135,94 @@ class Handler(traitlets.HasTraits):
             }
         )
         super().__init__(parent=parent, wait=wait, callable=func, locals=locals, globals=globals)
-        App.wait or App.parent.events.register("post_execute", App.user_ns_handler)
+        if App.globals and not App.wait:
+            watch(App)
 
         if not App.callable and callable(App):
             App.callable = lambda _: App()
 
+        children, traits = [], {}
         for alias, dict in zip("globals locals".split(), (App.globals, App.locals)):
             for name, object in dict.items():
                 App.display[name] = widget = App.widget_from_abbrev(name, object)
-                App.children += (widget,)
-                if "value" in widget.traits():
-                    App.add_traits(**{name: type(widget.traits()["value"])(widget.value)})
-                    if App.wait:
-                        App.wait_handler
-                    else:
-                        traitlets.link((widget, "value"), (App, name))
-                if name in App.globals:
-                    App.observe(App.globals_handler, name)
+                children.append(widget)
+                trait = widget.traits().get("value")
+                if trait is not None:
+                    traits[name] = type(trait)(widget.value)
+        if traits:
+            App.add_traits(**traits)
+
+        for name, widget in App.display.items():
+            if name in traits:
+                if App.wait:
+                    App.wait_handler
+                else:
+                    App.links.append(traitlets.link((widget, "value"), (App, name)))
+            if name in globals:
+                App.observe(App.globals_handler, name)
+        if App.callable:
+            children.append(App.display_cls(description="result", value=App.callable(App)))
+        App.children = tuple(children)
 
         if App.callable:
-            App.children += (App.display_cls(description="result", value=App.callable(App)),)
             App.observe(App.call)
 
     def user_ns_handler(App, *args):
-        with pandas_ambiguity():
-            [
-                str in App.parent.user_ns and setattr(App, str, App.parent.user_ns[str])
-                for str in App.globals
-            ]
+        user_ns = App.parent.user_ns
+        changes = {}
+        for str in App.globals:
+            object = user_ns.get(str, missing)
+            if object is not missing and object is not getattr(App, str, missing):
+                changes[str] = object
+        with App.hold_call(), pandas_ambiguity(
+            *changes.values(), *(getattr(App, str, None) for str in changes)
+        ), App.hold_trait_notifications():
+            for str, object in changes.items():
+                setattr(App, str, object)
 
     def globals_handler(App, change):
         if change["type"] == "change":
             App.parent.user_ns[change["name"]] = change["new"]
 
+    held = None
+
+    @contextlib.contextmanager
+    def hold_call(App):
+        """`Handler.hold_call` defers `Handler.call` and other `Handler.defer`red observers until the block exits so a burst of changes runs each of them once.
+>>> calls = []
+>>> get_ipython().user_ns.update(foo=1, bar=1)
+>>> handler = Handler('foo bar', callable=lambda handler: calls.append((handler.foo, handler.bar)))
+>>> result = get_ipython().run_cell('foo = bar = 2', store_history=False)
+>>> calls
+[(1, 1), (2, 2)]
+>>> handler.__exit__()"""
+
+        if App.held is not None:
+            yield
+            return
+        App.held = {}
+        try:
+            yield
+        finally:
+            held, App.held = App.held, None
+            for callable, change in held.items():
+                callable(change)
+
+    def defer(App, callable, change):
+        """`Handler.defer` calls `callable` with the `change` now, or once with the latest `change` when the enclosing `Handler.hold_call` exits."""
+
+        if App.held is None:
+            return callable(change)
+        App.held[callable] = change
+
     def call(App, change):
-        with pandas_ambiguity(), App.children[-1]:
+        if App.held is not None:
+            return App.defer(App.call, change)
+        with pandas_ambiguity(
+            *(getattr(App, str, None) for str in itertools.chain(App.globals, App.locals))
+        ), App.children[-1]:
             value = App.callable(App)
-            IPython.display.display(value)
+            display(value)
 
     def wait_handler(App, change):
         ...
@@ -168,49 +234,116 @@ class Handler(traitlets.HasTraits):
         return App
 
     def __exit__(App, *e):
-        for children in App.children[0]:
-            [hasattr(child, "value") and child.unobserve("value") for child in children]
-        App.unobserve(None), App.wait or App.parent.events.unregister(
-            "post_execute", App.user_ns_handler
-        )
+        """`Handler.__exit__` unlinks the widgets and stops watching the shell; exiting again is harmless.
+>>> with Handler('foo') as h: pass
+>>> h.__exit__()"""
+
+        while App.links:
+            App.links.pop().unlink()
+        App.unobserve_all()
+        unwatch(App)
 
     def _ipython_display_(App):
-        [object.display(object) for object in App.children]
+        for object in App.children:
+            object.display(object)
+
+
+def truthy(object):
+    return True
 
 
 @contextlib.contextmanager
-def pandas_ambiguity(nz=None):
+def pandas_ambiguity(*objects):
+    """`pandas_ambiguity` makes `pandas` objects truthy inside the block; given `objects` it only patches when one of them is a `pandas` object."""
+
     pandas = sys.modules.get("pandas", None)
-    if pandas:
-        pandas.Series.__bool__ = pandas.DataFrame.__bool__ = lambda df: True
-        yield
+    if (
+        pandas
+        and "__bool__" not in vars(pandas.Series)
+        and (
+            not objects
+            or any(isinstance(object, (pandas.Series, pandas.DataFrame)) for object in objects)
+        )
+    ):
+        pandas.Series.__bool__ = pandas.DataFrame.__bool__ = truthy
         try:
-            del pandas.DataFrame.__bool__, pandas.Series.__bool__
-        except:
-            ...
+            yield
+        finally:
+            for cls in pandas.Series, pandas.DataFrame:
+                if vars(cls).get("__bool__") is truthy:
+                    del cls.__bool__
     else:
         yield
 
 
+shells, callbacks, missing = {}, {}, object()
+
+
+def watch(App):
+    """`watch` fans one `post_execute` callback per shell out to every `Handler` watching its namespace."""
+
+    if App.parent not in shells:
+        shells[App.parent] = {}
+        callbacks[App.parent] = functools.partial(post_execute, shells[App.parent])
+        App.parent.events.register("post_execute", callbacks[App.parent])
+    shells[App.parent][App] = None
+
+
+def unwatch(App):
+    shells.get(App.parent, {}).pop(App, None)
+
+
+def post_execute(handlers):
+    for App in tuple(handlers):
+        App.user_ns_handler()
+
+
 @IPython.core.magic.magics_class
 class Magic(IPython.core.magic.Magics):
     """>>> %ypp foo
 <...App...>
 >>> %%ypp
 ...        print(foo)
-WidgetOutput(...Output...)"""
+WidgetOutput(...Output...)
+
+Rerunning a `%%ypp` cell replaces its previous `App`.
+>>> magic = get_ipython().magics_manager.registry['Magic']
+>>> for i in range(2): output = get_ipython().run_cell_magic('ypp', 'foo', 'pass')
+>>> list(magic.apps[magic.key()[0]][1]).count(('foo', 'pass'))
+1"""
 
     @IPython.core.magic.line_magic("ypp")
     def line(self, line):
         return App(line)
 
+    apps = traitlets.Dict()
+
     @IPython.core.magic.cell_magic("ypp")
     def cell(self, line, cell):
-        app, object = App(line), (ipywidgets and WidgetOutput or TraitletOutput)()
-        self.update(cell, object, {}),
-        app.observe(functools.partial(self.update, cell, object), line.split())
+        key, request = self.key()
+        previous, apps = self.apps.get(key, (None, {}))
+        if request != previous:
+            for app in apps.values():
+                app.__exit__()
+            apps = {}
+        if (line, cell) in apps:
+            apps.pop((line, cell)).__exit__()
+        app, object = App(line), output_cls()
+        self.update(cell, object, {})
+        app.observe(
+            functools.partial(app.defer, functools.partial(self.update, cell, object)), line.split()
+        )
+        apps[line, cell] = app
+        self.apps[key] = request, apps
         return object
 
+    def key(self):
+        """`Magic.key` names the frontend cell and the request running it when the kernel provides them.
+A new run of a cell, edited or not, replaces all of its `App`s; within one run only a repeated `%%ypp` call replaces its own."""
+
+        parent = getattr(self.shell, "get_parent", dict)() or {}
+        return parent.get("metadata", {}).get("cellId"), parent.get("header", {}).get("msg_id")
+
     def update(self, cell, object, change):
         with object:
             IPython.get_ipython().run_cell(cell)
@@ -227,7 +360,10 @@ if ipywidgets:
             WidgetOutput.children += (WidgetOutput.output,)
             WidgetOutput._titles = {0: WidgetOutput.description}
             WidgetOutput.observe(WidgetOutput.update, "value")
-            WidgetOutput.update({"new": WidgetOutput.value})
+            if WidgetOutput.value is not None:
+                WidgetOutput.update({"new": WidgetOutput.value})
+            elif not WidgetOutput.selected_index:
+                WidgetOutput._change_index({"new": None})
 
         @traitlets.observe("selected_index")
         def _change_index(WidgetOutput, change):
@@ -247,7 +383,7 @@ if ipywidgets:
 
         def update(WidgetOutput, change):
             with WidgetOutput:
-                IPython.display.display(change["new"])
+                display(change["new"])
 
             if not WidgetOutput.selected_index:
                 WidgetOutput._change_index({"new": None})
@@ -255,8 +391,35 @@ if ipywidgets:
     w = WidgetOutput(value=range, description="Test")
 
 
+output_cls = WidgetOutput if ipywidgets else TraitletOutput
+
+
 if ipywidgets:
 
+    def select_multiple(App, name, annotation, object):
+        return ipywidgets.SelectMultiple(options=tuple(annotation), value=object)
+
+    def annotated_widget(App, name, annotation, object):
+        return annotation
+
+    def output_widget(App, name, annotation, object):
+        return WidgetOutput(description=name, value=object)
+
+    def abbrev_widget(App, name, annotation, object):
+        return ipywidgets.interactive.widget_from_abbrev(
+            annotation, App.locals.get(name, App.parent.user_ns.get(name, object))
+        )
+
+    @functools.lru_cache(None)
+    def widget_factory(annotation, object):
+        if "pandas" in sys.modules and issubclass(object, sys.modules["pandas"].DataFrame):
+            return output_widget
+        if issubclass(annotation, list):
+            return select_multiple
+        if issubclass(annotation, ipywidgets.Widget):
+            return annotated_widget
+        return abbrev_widget
+
     class App(Handler):
         container = traitlets.Instance(ipywidgets.VBox)
         display_cls = traitlets.Type(WidgetOutput)
@@ -270,67 +433,71 @@ if ipywidgets:
                 if dict:
                     children.append(
                         ipywidgets.Accordion(
-                            children=[ipywidgets.VBox(layout={"display": "flex"})],
+                            children=[
+                                ipywidgets.VBox(
+                                    tuple(App.display[name] for name in dict),
+                                    layout={"display": "flex"},
+                                )
+                            ],
                             _titles={0: alias},
                         )
                     )
-                    for name, object in dict.items():
-                        children[-1].children[0].children += (App.display[name],)
+            if App.callable:
+                children.append(App.children[-1])
             App.container.children = tuple(children)
 
-            if App.callable:
-                App.container.children += (App.children[-1],)
+        annotations = traitlets.Dict()
 
-        def widget_from_abbrev(App, name, object, *, widget=None):
-            annotation = {
+        @traitlets.default("annotations")
+        def _default_annotations(App):
+            """`App.annotations` merges the shell and class annotations once, on the first `App.widget_from_abbrev`."""
+
+            return {
                 **App.parent.user_ns.get("__annotations__", {}),
                 **getattr(App, "__annotations__", {}),
-            }.get(name, object)
-            if "pandas" in sys.modules and isinstance(object, sys.modules["pandas"].DataFrame):
-                ...
-            elif isinstance(annotation, list):
-                widget = ipywidgets.SelectMultiple(options=tuple(annotation), value=object)
-            elif isinstance(annotation, ipywidgets.Widget):
-                widget = annotation
-            else:
-                widget = ipywidgets.interactive.widget_from_abbrev(
-                    annotation, App.locals.get(name, App.parent.user_ns.get(name, object))
-                )
+            }
+
+        def widget_from_abbrev(App, name, object, *, widget=None):
+            annotation = App.annotations.get(name, object)
+            widget = widget_factory(type(annotation), type(object))(App, name, annotation, object)
             widget = widget or WidgetOutput(description=name, value=object)
             widget.description = name
             return widget
 
         def _ipython_display_(App):
-            IPython.display.display(App.container)
+            display(App.container)
 
 
-try:
-    import ipywxyz
+else:
+    App = Handler
+
+
+if ipywidgets and importlib.util.find_spec("ipywxyz"):
 
     class WXYZ(App):
-        container = traitlets.Instance(ipywxyz.DockBox)
-        _ = traitlets.default("container")(lambda x: ipywxyz.DockBox(layout={"height": "20vh"}))
+        container = traitlets.Instance("ipywxyz.DockBox")
+        _ = traitlets.default("container")(
+            lambda x: __import__("ipywxyz").DockBox(layout={"height": "20vh"})
+        )
 
         def __init__(App, *args, **kwargs):
             App.container.children = Handler.__init__(App, *args, **kwargs) or App.children
 
 
-except:
-    ...
-
-
 def load_ipython_extension(shell):
     shell.register_magics(Magic)
 
 
 def unload_ipython_extension(shell):
-    ...
+    for App in tuple(shells.pop(shell, {})):
+        App.__exit__()
+    if shell in callbacks:
+        shell.events.unregister("post_execute", callbacks.pop(shell))
 
 
 if __name__ == "__main__":
     import pidgin, nbconvert
 
-    display = IPython.display.display
     with open("ypp.py", "w") as f:
         f.write(
             __import__("black").format_str(